@@ -1,21 +1,43 @@
 # Main application entry point for e-commerce/PWA webstore
 # Imports core libraries, models, and initializes Flask app
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, make_response
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, make_response, g
 from functools import wraps
+from jinja2 import FileSystemBytecodeCache
 from math import ceil
 import os
+import re
 import json
+import time
+import atexit
+import random
+import secrets
+import threading
+from collections import Counter, defaultdict
 from decimal import Decimal
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.local import LocalProxy
 from datetime import timedelta, datetime
-from sqlalchemy import func, desc, distinct, or_
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, func, desc, or_, case, text, column, select, insert, update, bindparam, exists
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload, raiseload
 import uuid
 
+# orjson is optional; when installed it speeds up the cart cookie encode/decode done on most requests
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
 # Import models and db
 from models import db, User, Product, Order, OrderItem, Review, Favorite, Notification, \
-    PasswordResetToken, ProductReport, ProductView, Address, Bid
+    PasswordResetToken, ProductReport, ProductView, Address, Bid, PRODUCTS_FTS_SCHEMA
 
 
 # --- Flask app configuration: session, upload, and security settings ---
@@ -27,10 +49,19 @@ app.config['PREFERRED_URL_SCHEME'] = os.environ.get('PREFERRED_URL_SCHEME', 'htt
 # Optionally pin a canonical server name for absolute URL generation (off by default)
 if os.environ.get('SERVER_NAME'):
     app.config['SERVER_NAME'] = os.environ['SERVER_NAME']
+# Template mtime checks follow debug mode (off in production, on under app.run(debug=True));
+# TEMPLATES_AUTO_RELOAD=1/0 in the environment overrides that either way
+if os.environ.get('TEMPLATES_AUTO_RELOAD') in ('0', '1'):
+    app.config['TEMPLATES_AUTO_RELOAD'] = os.environ['TEMPLATES_AUTO_RELOAD'] == '1'
+# Optionally persist compiled template bytecode so restarts skip recompiling (off by default)
+if os.environ.get('JINJA_CACHE_DIR'):
+    os.makedirs(os.environ['JINJA_CACHE_DIR'], exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.environ['JINJA_CACHE_DIR'])
 
 # --- File upload configuration: sets allowed image types and max file size ---
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -41,66 +72,340 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 def allowed_file(filename):
     """Return True if the uploaded file has an allowed image extension (png, jpg, jpeg, gif, webp)."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
 
 # --- SQLAlchemy database configuration: sets up SQLite URI and options ---
 DB_PATH = os.path.join(os.path.dirname(__file__), "webstore.db")
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SQLALCHEMY_ECHO'] = False  # Set to True for SQL debugging
+# Keep a warm pool of connections for the threaded workers and a larger compiled-statement cache
+# (pre-ping/recycle are left off: SQLite connections are local files and never go stale)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'query_cache_size': 1200,
+}
+
+# Development guard against N+1 queries: with RAISELOAD=1, any relationship a query didn't load
+# explicitly (joinedload/selectinload/contains_eager) raises instead of lazy-loading one row at a time
+app.config['SQLALCHEMY_RAISELOAD'] = os.environ.get('RAISELOAD') == '1'
 
 # --- Initialize SQLAlchemy ORM ---
 db.init_app(app)
 
+if app.config['SQLALCHEMY_RAISELOAD']:
+    @event.listens_for(Session, 'do_orm_execute')
+    def _raise_on_lazy_load(orm_execute_state):
+        if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload('*'))
+
+def ensure_products_fts():
+    """Create the products_fts search index (and sync triggers) if missing; return False if FTS5 is unavailable."""
+    try:
+        with db.engine.begin() as conn:
+            fts_present = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")).first()
+            conn.connection.executescript(PRODUCTS_FTS_SCHEMA)
+            if not fts_present:
+                # Index rows that were inserted before the search table existed
+                conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+        return True
+    except OperationalError:
+        return False
+
+def dedupe_product_views():
+    """Drop duplicate (user_id, product_id) view rows, keeping the latest, so the unique index can be built.
+    Databases written before views became upserts can hold one row per view."""
+    with db.engine.begin() as conn:
+        conn.execute(text("""
+            DELETE FROM product_views
+            WHERE user_id IS NOT NULL AND id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY user_id, product_id ORDER BY viewed_at DESC, id DESC
+                    ) AS rn
+                    FROM product_views WHERE user_id IS NOT NULL
+                ) WHERE rn = 1
+            )
+        """))
+
+def ensure_indexes():
+    """Create model indexes that are missing on existing tables (create_all only adds them with new tables)."""
+    with db.engine.connect() as conn:
+        existing = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    if 'ix_productview_user_product' not in existing:
+        dedupe_product_views()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+# Per-connection SQLite tuning: NORMAL sync is safe under WAL and skips an fsync per commit; temp tables,
+# a 20MB page cache and 256MB of mmap keep reads off the syscall path
+SQLITE_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=268435456',
+)
+
+def _tune_sqlite_connection(dbapi_connection, connection_record):
+    """Apply SQLITE_CONNECTION_PRAGMAS once when the pool opens a new connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def enable_wal():
+    """Switch the database to write-ahead logging (persistent in the file) so readers don't block on writers."""
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('PRAGMA journal_mode=WAL')
+
+# Templates compiled at startup so the first hit on a busy page (or a 404 under load) doesn't pay for it
+PREWARM_TEMPLATES = (
+    '404.html', 'index.html', 'products.html', 'product_detail.html', 'cart.html', 'checkout.html',
+    'favorites.html', 'my_bids.html', 'seller_dashboard.html', 'navbar.html', 'footer.html',
+)
+
+def prewarm_templates():
+    """Compile PREWARM_TEMPLATES into Jinja's template cache."""
+    for name in PREWARM_TEMPLATES:
+        app.jinja_env.get_template(name)
+
 # --- Create database tables if not present (first run) ---
 with app.app_context():
+    event.listen(db.engine, 'connect', _tune_sqlite_connection)
+    enable_wal()
     db.create_all()
+    ensure_indexes()
+    SEARCH_FTS_ENABLED = ensure_products_fts()
+    prewarm_templates()
+
+def product_search_filter(term, like_columns, fts_columns=None):
+    """Build a filter matching products whose text contains every word in term.
+    Uses the products_fts index (prefix match per word) when available, otherwise LIKE scans on like_columns."""
+    words = re.findall(r'\w+', term)
+    if not SEARCH_FTS_ENABLED or not words:
+        return or_(*[col.like(f'%{term}%') for col in like_columns])
+    match = ' '.join(f'"{w}"*' for w in words)
+    if fts_columns:
+        match = '{' + ' '.join(fts_columns) + '} : ' + match
+    fts_ids = text("SELECT rowid FROM products_fts WHERE products_fts MATCH :match")\
+        .bindparams(match=match)\
+        .columns(column('rowid'))
+    return Product.id.in_(fts_ids)
+
+# --- In-process TTL cache for read-heavy, rarely-changing query results ---
+CACHE_MAX_ENTRIES = 1024
+_cache = {}
+_cache_lock = threading.Lock()
+
+def cache_get(key, default=None):
+    """Return the cached value for key if still fresh, else default."""
+    entry = _cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return default
+
+def cache_set(key, ttl, value):
+    """Cache value under key for ttl seconds, evicting expired (then oldest) entries when full."""
+    now = time.monotonic()
+    with _cache_lock:
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            for k in [k for k, (expires, _) in _cache.items() if expires <= now]:
+                _cache.pop(k, None)
+            while len(_cache) >= CACHE_MAX_ENTRIES:
+                _cache.pop(next(iter(_cache)))
+        _cache[key] = (now + ttl, value)
+
+def cache_get_or_set(key, ttl, loader):
+    """Return the cached value for key if still fresh, otherwise call loader() and cache it for ttl seconds."""
+    entry = _cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    value = loader()
+    cache_set(key, ttl, value)
+    return value
+
+def cache_invalidate(*prefixes):
+    """Remove cached entries whose key starts with any of the given prefixes."""
+    with _cache_lock:
+        for k in [k for k in _cache if k.startswith(prefixes)]:
+            _cache.pop(k, None)
+
+def invalidate_product_caches():
+    """Clear cached product listings/search results after products are created, changed, or deleted."""
+    cache_invalidate('index:', 'autocomplete:', 'products:', 'product:')
+
+PRODUCT_CACHE_TTL = 60
+
+def get_product_rows(ids):
+    """Return {str id: row(id, title, price, stock, image_url)} for display, reading through the cache.
+    Only ids missing from the cache are queried, in one IN query. Not for checkout, which needs live rows."""
+    rows = {}
+    misses = []
+    for pid in ids:
+        row = cache_get(f'product:{pid}')
+        if row is None:
+            misses.append(pid)
+        else:
+            rows[str(pid)] = row
+    if misses:
+        for row in db.session.query(Product.id, Product.title, Product.price, Product.stock, Product.image_url)\
+                .filter(Product.id.in_(misses)).all():
+            cache_set(f'product:{row.id}', PRODUCT_CACHE_TTL, row)
+            rows[str(row.id)] = row
+    return rows
+
+# Compiled once; each character class is checked in the regex engine instead of a per-character Python loop
+_PW_LOWER_RE = re.compile(r'[a-z]')
+_PW_UPPER_RE = re.compile(r'[A-Z]')
+_PW_DIGIT_RE = re.compile(r'\d')
+_PW_SPECIAL_RE = re.compile(r'[\W_]')
 
 def is_strong_password(pw: str) -> bool:
     """Check if password meets strong policy: 8+ chars, lower/upper/digit/special."""
     if not pw or len(pw) < 8:
         return False
-    has_lower = any(c.islower() for c in pw)
-    has_upper = any(c.isupper() for c in pw)
-    has_digit = any(c.isdigit() for c in pw)
-    has_special = any(not c.isalnum() for c in pw)
-    return has_lower and has_upper and has_digit and has_special
+    return (_PW_LOWER_RE.search(pw) is not None
+            and _PW_UPPER_RE.search(pw) is not None
+            and _PW_DIGIT_RE.search(pw) is not None
+            and _PW_SPECIAL_RE.search(pw) is not None)
+
+# --- Password hashing: one tunable KDF setting for every hash the app writes ---
+# Defaults to Werkzeug's own scrypt cost (N=2^15, r=8, p=1), which existing hashes already use; override via env.
+# Hashes written with a weaker setting are upgraded on the next login, stronger ones are left alone.
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+# Each IP may run at most one password check per this many seconds; extra attempts are refused without hashing
+LOGIN_RETRY_SECONDS = 1
+# Login slots live apart from the shared query cache so an IP spray can't evict cached pages
+_login_slots = {}
+_login_slots_lock = threading.Lock()
+
+def claim_login_slot(ip):
+    """Atomically reserve this IP's password check for the next LOGIN_RETRY_SECONDS; False if already taken."""
+    now = time.monotonic()
+    with _login_slots_lock:
+        if _login_slots.get(ip, 0) > now:
+            return False
+        if len(_login_slots) >= CACHE_MAX_ENTRIES:
+            # Slots expire within seconds, so dropping the stale ones keeps the dict small
+            for stale_ip in [k for k, until in _login_slots.items() if until <= now]:
+                del _login_slots[stale_ip]
+        _login_slots[ip] = now + LOGIN_RETRY_SECONDS
+        return True
+
+def hash_password(password):
+    """Hash a password with the configured KDF."""
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
+def _hash_needs_upgrade(password_hash):
+    """True if password_hash was made with a different KDF or a lower cost than PASSWORD_HASH_METHOD."""
+    stored_method = password_hash.split('$', 1)[0]
+    if stored_method == PASSWORD_HASH_METHOD:
+        return False
+    stored_name, *stored_params = stored_method.split(':')
+    wanted_name, *wanted_params = PASSWORD_HASH_METHOD.split(':')
+    if stored_name != wanted_name:
+        return True
+    try:
+        # Only move to the configured cost if some parameter of the stored hash is below it
+        return any(int(have) < int(want) for have, want in zip(stored_params, wanted_params))
+    except ValueError:
+        return False
+
+def verify_password(user, password):
+    """Check password against user's hash, rehashing it (uncommitted) if it used a weaker KDF setting."""
+    if not check_password_hash(user.password_hash, password):
+        return False
+    if _hash_needs_upgrade(user.password_hash):
+        user.password_hash = hash_password(password)
+    return True
 
 def ensure_cart():
-    """Retrieve cart from session, or load from cookie if session cart is missing/empty."""
-    if 'cart' not in session or not session['cart']:
-        # Try to load from cookie
+    """Retrieve cart from session, or load from cookie if session cart is missing/empty.
+    The resolved cart is cached on `g` so the cookie is decoded at most once per request."""
+    if '_cart' in g:
+        return g._cart
+    cart = session.get('cart')
+    if not cart:
+        # Try to load from cookie; an empty cart is not written back, so visitors without a cart
+        # don't get a freshly signed session cookie on every page
+        cart = load_cart_cookie()
+        if cart:
+            session['cart'] = cart
+    g._cart = cart
+    return g._cart
+
+def set_cart(cart, changed=True):
+    """Store the cart in the session (only if it changed, to avoid re-signing the cookie) and refresh the request-level cart cache.
+    The cart from ensure_cart() may be mutated in place; pass changed=False when nothing was modified."""
+    if session.get('cart') is cart:
+        # Same dict the session holds: in-place edits aren't detected, so flag them explicitly
+        if changed:
+            session.modified = True
+    elif session.get('cart') != cart:
+        session['cart'] = cart
+    g._cart = cart
+    g.pop('_cart_count', None)
+
+def clear_cart():
+    """Remove the cart from the session and drop the request-level cart cache."""
+    if 'cart' in session:
+        session.pop('cart')
+    g.pop('_cart', None)
+    g.pop('_cart_count', None)
+
+def cart_item_count():
+    """Return the total number of items in the cart, computed at most once per request."""
+    if '_cart_count' not in g:
+        cart = ensure_cart()
+        g._cart_count = sum(cart.values()) if cart else 0
+    return g._cart_count
+
+def load_cart_cookie():
+    """Decode the cart cookie sent with this request (decoded once, cached on `g`); {} if missing or invalid."""
+    if '_cart_cookie' not in g:
         cart_cookie = request.cookies.get('cart')
+        cookie_cart = {}
         if cart_cookie:
             try:
-                session['cart'] = json.loads(cart_cookie)
-            except (json.JSONDecodeError, ValueError):
-                session['cart'] = {}
-        else:
-            session['cart'] = {}
-    return session['cart']
+                cookie_cart = _json_loads(cart_cookie)
+            except ValueError:
+                cookie_cart = {}
+        g._cart_cookie = cookie_cart if isinstance(cookie_cart, dict) else {}
+    return dict(g._cart_cookie)
 
 def save_cart_to_cookie(response, cart):
-    """Serialize cart as JSON and store in cookie for 30-day persistence."""
-    cart_json = json.dumps(cart)
+    """Serialize cart as compact JSON and store in cookie for 30-day persistence.
+    Skips the Set-Cookie header when the browser already holds the same cart."""
+    cart_json = _json_dumps(cart)
+    if request.cookies.get('cart') == cart_json:
+        return response
     response.set_cookie('cart', cart_json, max_age=30*24*60*60, httponly=True, samesite='Lax')
     return response
 
-def cart_total_items_and_amount(cart):
-    """Calculate total items and total amount in the cart."""
-    total_items = 0
-    total_amount = Decimal("0.00")
+def cart_total_items_and_amount(cart, products_by_id=None):
+    """Calculate total items and total amount in the cart.
+    Pass `products_by_id` (str id -> row with a price) to reuse rows already fetched by the caller."""
     if not cart:
-        return total_items, total_amount
-    ids = list(cart.keys())
-    products = Product.query.filter(Product.id.in_(ids)).all()
-    product_prices = {str(p.id): Decimal(str(p.price)) for p in products}
-    for pid, qty in cart.items():
-        total_items += qty
-        price = product_prices.get(str(pid), Decimal("0.00"))
-        total_amount += price * qty
+        return 0, Decimal("0.00")
+    if products_by_id is None:
+        # Display totals only, so cached rows are fine (checkout prices the order from live rows)
+        products_by_id = get_product_rows(list(cart.keys()))
+    total_items = sum(cart.values())
+    # One Decimal per cart line that has a product; lines whose product is gone add nothing
+    total_amount = sum((Decimal(str(products_by_id[str(pid)].price)) * qty
+                        for pid, qty in cart.items() if str(pid) in products_by_id), Decimal("0.00"))
     return total_items, total_amount
 
+def _current_user():
+    """Return the logged-in User, loading it at most once per request (cached on `g`).
+    Also backs admin_required and the navbar role flags, so role checks never add a second lookup."""
+    if '_cached_user' not in g:
+        uid = session.get('user_id')
+        g._cached_user = db.session.get(User, uid) if uid else None
+    return g._cached_user
+
 def login_required(f):
     """Decorator to require user login for protected routes."""
     @wraps(f)
@@ -110,27 +415,27 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated
 
+def _current_user_is_admin():
+    """Navbar admin flag: the 'Bean' account or any user with is_admin set."""
+    user = _current_user()
+    if not user:
+        return False
+    allowed_admin_username = 'Bean'
+    return bool((user.username and user.username.strip().lower() == allowed_admin_username.strip().lower()) or user.is_admin)
+
+def _current_user_is_seller():
+    """Navbar seller flag for the logged-in user."""
+    user = _current_user()
+    return bool(user and user.is_seller)
+
 @app.context_processor
 def inject_user_permissions():
-    """Inject user role flags (admin/seller) and cart item count into Jinja2 templates for navbar and permissions."""
-    uid = session.get('user_id')
-    is_admin_flag = False
-    is_seller_flag = False
-    if uid:
-        user = User.query.get(uid)
-        if user:
-            allowed_admin_username = 'Bean'
-            if (user.username and user.username.strip().lower() == allowed_admin_username.strip().lower()) or user.is_admin:
-                is_admin_flag = True
-            if user.is_seller:
-                is_seller_flag = True
-    # Get cart item count from session/cookie
-    cart = ensure_cart()
-    cart_item_count = sum(cart.values()) if cart else 0
+    """Inject user role flags (admin/seller) and cart item count into Jinja2 templates for navbar and permissions.
+    The role flags are lazy proxies: the user is only loaded when a template actually tests one."""
     return {
-        'current_user_is_admin': is_admin_flag, 
-        'current_user_is_seller': is_seller_flag,
-        'cart_item_count': cart_item_count
+        'current_user_is_admin': LocalProxy(_current_user_is_admin), 
+        'current_user_is_seller': LocalProxy(_current_user_is_seller),
+        'cart_item_count': cart_item_count()
     }
 
 def admin_required(f):
@@ -140,7 +445,7 @@ def admin_required(f):
         uid = session.get('user_id')
         if not uid:
             return redirect(url_for('login', next=request.path))
-        user = User.query.get(uid)
+        user = _current_user()
         allowed_admin_username = 'Briscoe'
         has_name_match = bool(user and user.username and user.username.strip().lower() == allowed_admin_username.strip().lower())
         has_admin_flag = bool(user and user.is_admin)
@@ -151,11 +456,26 @@ def admin_required(f):
     return decorated
 
 
+def _popular_products():
+    """Most viewed in-stock products for the landing page ocean animation."""
+    popular_raw = db.session.query(
+        Product.id, Product.title, Product.price, Product.stock,
+        Product.image_url, Product.category, Product.view_count
+    ).filter(Product.stock > 0)
+    # Basic heuristic: require at least 1 view, order by view_count desc then newest
+    popular_raw = popular_raw.filter((Product.view_count.isnot(None)) & (Product.view_count > 0))\
+        .order_by(desc(Product.view_count), desc(Product.created_at))\
+        .limit(30)\
+        .all()
+    return [dict(row._mapping) for row in popular_raw]
+
 # --- Home page route: fetches featured, popular, recently viewed products, and auction info for main landing page ---
 @app.route('/')
 def index():
-    # Fetch featured products with seller info (exclude out of stock, limit to 9 for carousel)
-    featured_raw = db.session.query(
+    # Fetch featured products with seller info (exclude out of stock, limit to 9 for carousel).
+    # Identical for every visitor, so cached briefly; product writes clear the 'index:' prefix.
+    # Row mappings already support the p['key'] / p.keys() access the template uses, so no dict copies
+    featured = cache_get_or_set('index:featured', 60, lambda: [row._mapping for row in db.session.query(
         Product.id, Product.title, Product.description, Product.price, Product.stock, 
         Product.created_at, Product.seller_id, Product.image_url, Product.category,
         User.business_name, User.rating, User.username.label('seller_username')
@@ -163,31 +483,19 @@ def index():
      .filter(Product.stock > 0)\
      .order_by(desc(Product.created_at))\
      .limit(9)\
-     .all()
-    
-    # Convert to dictionaries for template compatibility
-    featured = [dict(row._mapping) for row in featured_raw]
+     .all()])
     
-    # Fetch stats
-    stats = {
-        'active_listings': Product.query.filter(Product.stock > 0).count(),
-        'total_sellers': db.session.query(func.count(distinct(User.id))).filter(User.is_seller == 1).scalar() or 0,
-        'total_buyers': db.session.query(func.count(distinct(User.id))).filter(User.is_seller == 0).scalar() or 0,
-        'total_users': User.query.count(),
-        'total_products': Product.query.count()
-    }
+    # Fetch stats in one round trip (cached briefly, they only feed the landing page counters)
+    stats = cache_get_or_set('index:stats', 60, lambda: dict(db.session.query(
+        select(func.count(Product.id)).where(Product.stock > 0).scalar_subquery().label('active_listings'),
+        select(func.count(User.id)).where(User.is_seller == 1).scalar_subquery().label('total_sellers'),
+        select(func.count(User.id)).where(User.is_seller == 0).scalar_subquery().label('total_buyers'),
+        select(func.count(User.id)).scalar_subquery().label('total_users'),
+        select(func.count(Product.id)).scalar_subquery().label('total_products')
+    ).one()._mapping))
 
     # Fetch most popular products (by view_count, in stock) for ocean animation
-    popular_raw = db.session.query(
-        Product.id, Product.title, Product.price, Product.stock,
-        Product.image_url, Product.category, Product.view_count
-    ).filter(Product.stock > 0)
-    # Basic heuristic: require at least 1 view, order by view_count desc then newest
-    popular_raw = popular_raw.filter((Product.view_count.isnot(None)) & (Product.view_count > 0))\
-        .order_by(desc(Product.view_count), desc(Product.created_at))\
-        .limit(30)\
-        .all()
-    popular_products = [dict(row._mapping) for row in popular_raw]
+    popular_products = cache_get_or_set('index:popular', 60, _popular_products)
     
     # Fetch recently viewed products (exclude out of stock)
     recently_viewed = []
@@ -205,7 +513,7 @@ def index():
          .order_by(desc(ProductView.viewed_at))\
          .limit(8)\
          .all()
-        recently_viewed = [dict(row._mapping) for row in recently_viewed_raw]
+        recently_viewed = [row._mapping for row in recently_viewed_raw]
     
     # Ending soon auctions (next 24h)
     ending_soon_auctions = Product.query.filter(
@@ -245,20 +553,22 @@ def contact():
 # --- Live Search Autocomplete API endpoint ---
 @app.route('/api/search/autocomplete')
 def search_autocomplete():
-    query = request.args.get('q', '').strip()
+    # Normalize (case, whitespace, length) so equivalent keystrokes share one cached result
+    query = ' '.join(request.args.get('q', '').lower().split())[:32]
     if not query or len(query) < 2:
         return jsonify([])
     
+    results = cache_get_or_set(f'autocomplete:{query}', 300, lambda: _autocomplete_results(query))
+    return jsonify(results)
+
+def _autocomplete_results(query):
+    """Run the autocomplete product search for query and return JSON-ready dicts."""
     # Search products by title, description, or category
     products = db.session.query(
         Product.id, Product.title, Product.price, Product.image_url, 
         Product.category, Product.stock
     ).filter(
-        or_(
-            Product.title.like(f'%{query}%'),
-            Product.description.like(f'%{query}%'),
-            Product.category.like(f'%{query}%')
-        )
+        product_search_filter(query, [Product.title, Product.description, Product.category])
     ).filter(Product.stock > 0)\
      .order_by(desc(Product.view_count))\
      .limit(10)\
@@ -272,8 +582,7 @@ def search_autocomplete():
         'category': p.category,
         'url': url_for('product_detail', product_id=p.id)
     } for p in products]
-    
-    return jsonify(results)
+    return results
 
 # --- Help, Privacy, and Terms static page routes ---
 @app.route('/help')
@@ -288,6 +597,15 @@ def privacy():
 def terms():
     return render_template('terms.html')
 
+def get_categories():
+    """Return the sorted distinct product categories (cached for 5 minutes)."""
+    return cache_get_or_set('products:categories', 300, lambda: [
+        c[0] for c in db.session.query(Product.category).distinct()
+            .filter(Product.category.isnot(None)).order_by(Product.category).all()
+    ])
+
+MAX_PER_PAGE = 100
+
 # --- Products listing route: supports filtering, sorting, and pagination ---
 @app.route('/products')
 def products():
@@ -298,27 +616,28 @@ def products():
     min_price = request.args.get('min_price', '')
     max_price = request.args.get('max_price', '')
     auction_only = request.args.get('auction_only', '')
-    page = int(request.args.get('page', 1))
+    # Pages start at 1; junk or non-positive values would otherwise produce a negative OFFSET
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
     per_page_raw = request.args.get('per_page', 12)
     try:
         per_page = int(per_page_raw) if per_page_raw else 12
     except ValueError:
         per_page = 12
+    # Bound the page size so a single request can't materialize the whole catalog
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
     
     # Build query with explicit column selection
     query = db.session.query(
         Product.id, Product.title, Product.description, Product.price, Product.stock,
         Product.image_url, Product.category, Product.condition, Product.location,
-        Product.view_count, Product.created_at, Product.seller_id,
+        Product.view_count, Product.created_at, Product.seller_id, Product.is_auction,
         User.business_name, User.username.label('seller_name')
     ).outerjoin(User, Product.seller_id == User.id)
     
     # Apply filters
     if search:
-        query = query.filter(or_(
-            Product.title.like(f'%{search}%'),
-            Product.description.like(f'%{search}%')
-        ))
+        query = query.filter(product_search_filter(search, [Product.title, Product.description],
+                                                   fts_columns=['title', 'description']))
     if category:
         query = query.filter(Product.category == category)
     if condition:
@@ -346,18 +665,20 @@ def products():
     else:
         query = query.order_by(desc(Product.stock > 0), desc(Product.created_at))
     
-    # Pagination
-    total_products = query.count()
-    products_raw = query.offset((page-1)*per_page).limit(per_page).all()
-    products_list = [dict(row._mapping) for row in products_raw]
-    # Add is_auction flag for badge rendering
-    for prod in products_list:
-        prod['is_auction'] = prod.get('is_auction', 0) or 0
+    # Pagination: the window count carries the filtered total on every row, so one query serves both
+    # Memory is bounded by the MAX_PER_PAGE clamp on per_page; is_auction is selected above for
+    # badge rendering and row mappings are passed as-is
+    products_list = [row._mapping for row in query.add_columns(func.count().over().label('total_count'))
+                     .offset((page-1)*per_page).limit(per_page).all()]
+    if products_list:
+        total_products = products_list[0]['total_count']
+    else:
+        # Past the last page (or no matches): fall back to a plain count for the pager
+        total_products = query.count() if page > 1 else 0
     total_pages = ceil(total_products / per_page)
     
     # Get distinct categories and conditions for filters
-    categories = db.session.query(Product.category).distinct().filter(Product.category.isnot(None)).order_by(Product.category).all()
-    categories = [c[0] for c in categories]
+    categories = get_categories()
     
     conditions_list = ['new', 'used', 'refurbished']
     
@@ -377,12 +698,37 @@ def products():
                          total=total_products,
                          auction_only=auction_only)
 
+def has_purchased_product(user_id, product_id):
+    """Return True if the user has an order containing the product (SELECT EXISTS, no row loading)."""
+    return db.session.query(
+        exists().where(Order.id == OrderItem.order_id, Order.buyer_id == user_id, OrderItem.product_id == product_id)
+    ).scalar()
+
+RELATED_OVERSAMPLE = 3
+RELATED_MAX_PROBES = 200
+
+def get_category_id_range(category):
+    """(min id, max id, count) of in-stock products in category, or None; cached under the 'products:' prefix."""
+    def load():
+        low, high, count = db.session.query(func.min(Product.id), func.max(Product.id), func.count(Product.id))\
+            .filter(Product.category == category, Product.stock > 0).one()
+        return (low, high, count) if count else None
+    return cache_get_or_set(f'products:category-range:{category}', 300, load)
+
 # --- Product detail route: shows product info, reviews, auction data, and related products ---
 @app.route('/product/<int:product_id>')
 def product_detail(product_id):
-    # Track product view
-    track_product_view(product_id)
-    
+    uid = session.get('user_id')
+
+    # Review stats and the viewer's purchase/favorite flags ride along as correlated
+    # subqueries, so the product page needs one statement instead of four
+    approved_reviews = (Review.product_id == Product.id, Review.is_approved == 1)
+    review_count_sq = select(func.count(Review.id)).where(*approved_reviews).scalar_subquery()
+    avg_rating_sq = select(func.avg(Review.rating)).where(*approved_reviews).scalar_subquery()
+    can_review_sq = exists().where(Order.id == OrderItem.order_id, Order.buyer_id == uid,
+                                   OrderItem.product_id == Product.id)
+    is_favorited_sq = exists().where(Favorite.user_id == uid, Favorite.product_id == Product.id)
+
     # Fetch product with seller info - select specific columns to create dictionary
     product_raw = db.session.query(
         Product.id, Product.title, Product.description, Product.price, Product.stock,
@@ -391,7 +737,9 @@ def product_detail(product_id):
         Product.is_auction, Product.starting_bid, Product.current_bid,
         Product.auction_end, Product.reserve_price, Product.buy_now_price,
         User.business_name, User.username.label('seller_username'), User.rating.label('seller_rating'),
-        User.seller_description, User.total_sales
+        User.seller_description, User.total_sales,
+        review_count_sq.label('review_count'), avg_rating_sq.label('avg_rating'),
+        can_review_sq.label('can_review'), is_favorited_sq.label('is_favorited')
     ).outerjoin(User, Product.seller_id == User.id)\
      .filter(Product.id == product_id)\
      .first()
@@ -400,11 +748,11 @@ def product_detail(product_id):
         flash("Product not found.")
         return redirect(url_for('products'))
     
-    # Convert to dictionary
-    product = dict(product_raw._mapping)
+    # Track product view
+    track_product_view(product_id)
     
-    # Also need the actual Product object for auction checks
-    product_obj = Product.query.get(product_id)
+    # Row mapping (read-only, no copy) carries every column the auction checks below need
+    product = product_raw._mapping
 
     # Auction-specific data
     bid_history = []
@@ -415,52 +763,48 @@ def product_detail(product_id):
     time_remaining_str = None
     
     if product.get('is_auction'):
-        # Get bid history
-        bid_history = db.session.query(Bid, User.username)\
-            .join(User, Bid.user_id == User.id)\
+        # Load every bid (with its bidder) in one query; history, winning bid and the
+        # user's highest bid are all picked from this list below
+        bids = db.session.query(Bid)\
+            .join(Bid.bidder)\
+            .options(contains_eager(Bid.bidder))\
             .filter(Bid.product_id == product_id)\
             .order_by(desc(Bid.bid_amount))\
-            .limit(10)\
             .all()
         
+        # Get bid history
+        bid_history = [(b, b.bidder.username) for b in bids[:10]]
+        
         # Get winning bid
-        winning_bid = Bid.query.filter_by(product_id=product_id, is_winning=1).first()
+        winning_bid = next((b for b in bids if b.is_winning == 1), None)
         
         # Check if auction ended and calculate time remaining
-        if product.get('auction_end'):
-            # Parse the auction end time string to datetime
-            from datetime import datetime as dt
-            try:
-                auction_end_dt = dt.strptime(product['auction_end'], '%Y-%m-%d %H:%M:%S')
-                now = dt.utcnow()
+        # auction_end is a DateTime column, so the ORM already hands back a datetime
+        auction_end_dt = product.get('auction_end')
+        if auction_end_dt:
+            now = datetime.utcnow()
+            
+            if auction_end_dt <= now:
+                is_auction_ended = True
+            else:
+                # Calculate time remaining
+                time_remaining = auction_end_dt - now
                 
-                if auction_end_dt <= now:
-                    is_auction_ended = True
+                # Format time remaining as human-readable string
+                days = time_remaining.days
+                hours, remainder = divmod(time_remaining.seconds, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                
+                if days > 0:
+                    time_remaining_str = f"{days}d {hours}h {minutes}m"
+                elif hours > 0:
+                    time_remaining_str = f"{hours}h {minutes}m"
                 else:
-                    # Calculate time remaining
-                    time_remaining = auction_end_dt - now
-                    
-                    # Format time remaining as human-readable string
-                    days = time_remaining.days
-                    hours, remainder = divmod(time_remaining.seconds, 3600)
-                    minutes, seconds = divmod(remainder, 60)
-                    
-                    if days > 0:
-                        time_remaining_str = f"{days}d {hours}h {minutes}m"
-                    elif hours > 0:
-                        time_remaining_str = f"{hours}h {minutes}m"
-                    else:
-                        time_remaining_str = f"{minutes}m {seconds}s"
-            except (ValueError, TypeError):
-                # Invalid date format
-                time_remaining_str = "Unknown"
+                    time_remaining_str = f"{minutes}m {seconds}s"
         
-        # Get user's highest bid if logged in
-        uid = session.get('user_id')
+        # Get user's highest bid if logged in (bids are already sorted highest first)
         if uid:
-            user_highest_bid = Bid.query.filter_by(product_id=product_id, user_id=uid)\
-                .order_by(desc(Bid.bid_amount))\
-                .first()
+            user_highest_bid = next((b for b in bids if b.user_id == uid), None)
 
     # Fetch reviews with seller responses
     reviews = db.session.query(Review, User.username)\
@@ -469,39 +813,31 @@ def product_detail(product_id):
         .order_by(desc(Review.created_at))\
         .all()
 
-    # Get review stats
-    stats = db.session.query(
-        func.count(Review.id).label('c'),
-        func.avg(Review.rating).label('avg_rating')
-    ).filter(Review.product_id == product_id, Review.is_approved == 1).first()
-    
-    # Related products (same category)
-    related_products_raw = db.session.query(
-        Product.id, Product.title, Product.price, Product.stock, Product.image_url,
-        Product.category, User.business_name
-    ).outerjoin(User, Product.seller_id == User.id)\
-     .filter(Product.category == product.get('category'), Product.id != product_id, Product.stock > 0)\
-     .order_by(func.random())\
-     .limit(4)\
-     .all()
-    related_products = [dict(row._mapping) for row in related_products_raw]
-    
-    # Check if user favorited this
-    is_favorited = False
-    uid = session.get('user_id')
-    if uid:
-        is_favorited = Favorite.query.filter_by(user_id=uid, product_id=product_id).first() is not None
-    
-    # Determine if current user purchased this product (to allow reviewing)
-    can_review = False
-    if uid:
-        can_review = db.session.query(Order)\
-            .join(OrderItem)\
-            .filter(Order.buyer_id == uid, OrderItem.product_id == product_id)\
-            .first() is not None
+    # Related products (same category): probe random ids inside the category's id range with one
+    # primary-key IN query, then pick 4 of the hits (no scan or sort of the category's rows)
+    related_products = []
+    id_range = get_category_id_range(product.get('category'))
+    if id_range:
+        low, high, count = id_range
+        span = high - low + 1
+        # Enough probes to expect ~3x the 4 we need given how dense the range is, capped per request
+        probes = min(span, RELATED_MAX_PROBES, max(4, ceil(RELATED_OVERSAMPLE * 4 * span / count)))
+        probe_ids = random.sample(range(low, high + 1), probes)
+        related_raw = db.session.query(
+            Product.id, Product.title, Product.price, Product.stock, Product.image_url,
+            Product.category, User.business_name
+        ).outerjoin(User, Product.seller_id == User.id)\
+         .filter(Product.id.in_(probe_ids), Product.category == product.get('category'),
+                 Product.id != product_id, Product.stock > 0)\
+         .all()
+        related_products = [row._mapping for row in random.sample(related_raw, min(4, len(related_raw)))]
     
-    review_count = stats.c if stats else 0
-    avg_rating = float(stats.avg_rating) if stats and stats.avg_rating is not None else None
+    # Favorite/purchase flags came back with the product row (both false when logged out)
+    is_favorited = bool(uid and product['is_favorited'])
+    can_review = bool(uid and product['can_review'])
+
+    review_count = product['review_count'] or 0
+    avg_rating = float(product['avg_rating']) if product['avg_rating'] is not None else None
 
     return render_template('product_detail.html', 
                          product=product, 
@@ -545,10 +881,7 @@ def submit_review(product_id):
         return redirect(url_for('products'))
 
     # Ensure the user has purchased this product
-    has_purchased = db.session.query(Order)\
-        .join(OrderItem)\
-        .filter(Order.buyer_id == user_id, OrderItem.product_id == product_id)\
-        .first() is not None
+    has_purchased = has_purchased_product(user_id, product_id)
     
     if not has_purchased:
         flash('Only customers who purchased this item can leave a review.')
@@ -583,16 +916,19 @@ def submit_review(product_id):
 def cart_view():
     cart = ensure_cart()
     items = []
+    products_by_id = {}
     if cart:
+        # Load every cart product (cached rows, one IN query for misses) and reuse the rows for the totals
+        products_by_id = get_product_rows(list(cart.keys()))
         for pid, qty in cart.items():
-            product = Product.query.get(pid)
+            product = products_by_id.get(str(pid))
             if product:
                 items.append({
-                    'product': product,
+                    'product': dict(product._mapping),
                     'quantity': qty,
                     'line_total': float(product.price) * qty
                 })
-    total_items, total_amount = cart_total_items_and_amount(cart)
+    total_items, total_amount = cart_total_items_and_amount(cart, products_by_id)
     
     # Fetch recently viewed products (exclude out of stock)
     recently_viewed = []
@@ -626,7 +962,6 @@ def cart_add():
     # stock == None/NULL means unlimited
     stock = prod.stock
     cart = ensure_cart()
-    cart = dict(cart)
     current = cart.get(product_id, 0)
     add_requested = max(1, qty)
     if stock is not None:
@@ -642,7 +977,7 @@ def cart_add():
         add_amount = add_requested
 
     cart[product_id] = current + add_amount
-    session['cart'] = cart
+    set_cart(cart)
     total_items, total_amount = cart_total_items_and_amount(cart)
     wants_json = request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.accept_mimetypes.accept_json
     if wants_json:
@@ -682,8 +1017,9 @@ def cart_summary():
 @app.route('/cart/update', methods=['POST'])
 def cart_update():
     cart = ensure_cart()
-    cart = dict(cart)
-    # For each qty_<id> field, ensure quantity does not exceed stock
+    changed = False
+    # Collect the requested quantities from the qty_<id> fields
+    wanted = {}
     for pid, qty in request.form.items():
         if not pid.startswith("qty_"):
             continue
@@ -693,18 +1029,24 @@ def cart_update():
         except ValueError:
             q = 0
         if q <= 0:
-            cart.pop(prod_id, None)
+            if cart.pop(prod_id, None) is not None:
+                changed = True
             continue
-
-        # check stock for this product
-        product = Product.query.get(prod_id)
-        if product and product.stock is not None:
-            if q > product.stock:
-                q = product.stock
-                flash(f"Quantity for product {prod_id} reduced to available stock ({product.stock}).")
-
-        cart[prod_id] = q
-    session['cart'] = cart
+        wanted[prod_id] = q
+
+    # Load stock for all updated products in one query, then ensure quantity does not exceed stock
+    stocks = {}
+    if wanted:
+        stocks = {str(pid): stock for pid, stock in db.session.query(Product.id, Product.stock).filter(Product.id.in_(list(wanted))).all()}
+    for prod_id, q in wanted.items():
+        stock = stocks.get(prod_id)
+        if stock is not None and q > stock:
+            q = stock
+            flash(f"Quantity for product {prod_id} reduced to available stock ({stock}).")
+        if cart.get(prod_id) != q:
+            cart[prod_id] = q
+            changed = True
+    set_cart(cart, changed)
     flash("Cart updated.")
     response = make_response(redirect(url_for('cart_view')))
     response = save_cart_to_cookie(response, cart)
@@ -714,9 +1056,8 @@ def cart_update():
 @app.route('/cart/remove/<int:product_id>', methods=['POST'])
 def cart_remove(product_id):
     cart = ensure_cart()
-    cart = dict(cart)
-    cart.pop(str(product_id), None)
-    session['cart'] = cart
+    removed = cart.pop(str(product_id), None)
+    set_cart(cart, removed is not None)
     flash("Removed item.")
     response = make_response(redirect(url_for('cart_view')))
     response = save_cart_to_cookie(response, cart)
@@ -743,10 +1084,11 @@ def register():
             flash("Username or email already taken.")
             return redirect(url_for('register'))
         
-        pw_hash = generate_password_hash(password)
+        pw_hash = hash_password(password)
         new_user = User(username=username, email=email, password_hash=pw_hash, is_seller=0)
         db.session.add(new_user)
         db.session.commit()
+        cache_invalidate('users:')
         
         session['user_id'] = new_user.id
         session['username'] = username
@@ -763,30 +1105,33 @@ def login():
         username = request.form.get('username','').strip()
         password = request.form.get('password','')
         
+        # Claim the slot before hashing, so concurrent attempts from one IP can't each run scrypt
+        if not claim_login_slot(request.remote_addr):
+            flash("Too many attempts. Please wait a moment and try again.")
+            return redirect(url_for('login', next=request.args.get('next')))
+        
         user = User.query.filter((User.username == username) | (User.email == username)).first()
-        if not user or not check_password_hash(user.password_hash, password):
+        if not user or not verify_password(user, password):
             flash("Invalid credentials.")
             return redirect(url_for('login', next=request.args.get('next')))
+        if db.session.dirty:
+            db.session.commit()  # persist an upgraded password hash
         
         session['user_id'] = user.id
         session['username'] = user.username
         session.permanent = True
         
         # Merge cart from cookie if exists
-        cart_cookie = request.cookies.get('cart')
-        if cart_cookie:
-            try:
-                cookie_cart = json.loads(cart_cookie)
-                session_cart = session.get('cart', {})
-                # Merge: add cookie cart items to session cart
-                for pid, qty in cookie_cart.items():
-                    if pid in session_cart:
-                        session_cart[pid] = max(session_cart[pid], qty)
-                    else:
-                        session_cart[pid] = qty
-                session['cart'] = session_cart
-            except (json.JSONDecodeError, ValueError):
-                pass
+        cookie_cart = load_cart_cookie()
+        if cookie_cart:
+            session_cart = dict(session.get('cart') or {})
+            # Merge: add cookie cart items to session cart
+            for pid, qty in cookie_cart.items():
+                if pid in session_cart:
+                    session_cart[pid] = max(session_cart[pid], qty)
+                else:
+                    session_cart[pid] = qty
+            set_cart(session_cart)
         
         flash("Logged in.")
         response = make_response(redirect(request.args.get('next') or url_for('index')))
@@ -815,8 +1160,11 @@ def checkout():
 
     # build items list for display and compute total (include stock for checks)
     ids = list(cart.keys())
-    products = Product.query.filter(Product.id.in_(ids)).all()
-    product_dict = {str(p.id): p for p in products}
+    # Display/validation only needs a few columns, so no Product objects are built here
+    rows = db.session.query(Product.id, Product.title, Product.price, Product.stock, Product.image_url)\
+        .filter(Product.id.in_(ids))\
+        .all()
+    product_dict = {str(r.id): r for r in rows}
     
     items = []
     total = 0.0
@@ -825,7 +1173,7 @@ def checkout():
         if not p:
             continue
         line_total = float(p.price) * qty
-        items.append({"product": p, "quantity": qty, "line_total": line_total})
+        items.append({"product": p._mapping, "quantity": qty, "line_total": line_total})
         total += line_total
 
     if request.method == 'POST':
@@ -836,6 +1184,14 @@ def checkout():
             flash("Please fill all fields.")
             return redirect(url_for('checkout'))
 
+        # Load the rows being purchased only now, right before they are mutated;
+        # stock is re-validated against these fresh rows
+        locked_products = Product.query\
+            .filter(Product.id.in_(ids))\
+            .with_for_update()\
+            .all()
+        product_dict = {str(p.id): p for p in locked_products}
+
         # re-validate stock for all items before creating order
         insufficient = []
         for pid, qty in cart.items():
@@ -870,42 +1226,68 @@ def checkout():
         db.session.add(new_order)
         db.session.flush()  # Get the order ID
 
-        # save address for user (avoid duplicates due to UNIQUE constraint)
-        try:
-            if buyer_id:
-                existing_address = Address.query.filter_by(user_id=buyer_id, address_text=address).first()
-                if not existing_address:
-                    new_address = Address(user_id=buyer_id, label=None, address_text=address)
-                    db.session.add(new_address)
-        except Exception:
-            pass
+        # save address for user; the UNIQUE(user_id, address_text) constraint skips duplicates in the same statement
+        if buyer_id:
+            db.session.execute(
+                sqlite_insert(Address)
+                .values(user_id=buyer_id, label=None, address_text=address)
+                .on_conflict_do_nothing(index_elements=['user_id', 'address_text'])
+            )
 
         # insert order items and reduce stock
+        order_item_rows = []
+        stock_rows = []
+        seller_qty = defaultdict(int)
         for pid, qty in cart.items():
             prod = product_dict.get(str(pid))
             if not prod:
                 continue
-            unit_price = float(prod.price)
-            order_item = OrderItem(
-                order_id=new_order.id,
-                product_id=int(pid),
-                quantity=qty,
-                unit_price=unit_price
-            )
-            db.session.add(order_item)
-            
-            # decrement stock if not NULL
+            order_item_rows.append({
+                'order_id': new_order.id,
+                'product_id': int(pid),
+                'quantity': qty,
+                'unit_price': float(prod.price)
+            })
             if prod.stock is not None:
-                prod.stock = prod.stock - qty
-            
-            # increment seller's total_sales if seller_id present
+                stock_rows.append({'b_id': prod.id, 'b_qty': qty})
+            # tally quantity sold per seller
             if prod.seller_id:
-                seller = User.query.get(prod.seller_id)
-                if seller:
-                    seller.total_sales = (seller.total_sales or 0) + qty
+                seller_qty[prod.seller_id] += qty
+
+        # decrement stock for every line in one executemany, only while enough is left; the WHERE
+        # clause is re-checked by the database at write time, so a concurrent checkout cannot push
+        # stock below zero (SQLite ignores FOR UPDATE, this guard is what actually serializes the rows)
+        if stock_rows:
+            products_table = Product.__table__
+            result = db.session.execute(
+                update(products_table)
+                .where(products_table.c.id == bindparam('b_id'), products_table.c.stock >= bindparam('b_qty'))
+                .values(stock=products_table.c.stock - bindparam('b_qty')),
+                stock_rows
+            )
+            if result.rowcount != len(stock_rows):
+                db.session.rollback()
+                flash("An item sold out while you were checking out. Please review your cart.")
+                return redirect(url_for('cart_view'))
+
+        # one batched INSERT for all order lines, without building OrderItem objects
+        db.session.bulk_insert_mappings(OrderItem, order_item_rows)
+        
+        # increment each seller's total_sales once, again as a single executemany
+        if seller_qty:
+            users_table = User.__table__
+            db.session.execute(
+                update(users_table)
+                .where(users_table.c.id == bindparam('b_id'))
+                .values(total_sales=func.coalesce(users_table.c.total_sales, 0) + bindparam('b_qty')),
+                [{'b_id': sid, 'b_qty': sold} for sid, sold in seller_qty.items()]
+            )
         
         db.session.commit()
-        session.pop('cart', None)
+        invalidate_product_caches()
+        if buyer_id:
+            cache_invalidate(f'addresses:{buyer_id}:')
+        clear_cart()
 
         # redirect to order confirmation page
         flash("Order placed successfully!")
@@ -915,7 +1297,7 @@ def checkout():
         return response
 
     # GET: prefill name/email if available
-    user = User.query.get(session.get('user_id'))
+    user = _current_user()
     pre_name = user.username if user else ''
     pre_email = user.email if user else ''
     return render_template('checkout.html', items=items, total_amount=total, pre_name=pre_name, pre_email=pre_email)
@@ -923,18 +1305,13 @@ def checkout():
 # --- Order confirmation route: displays order details after purchase ---
 @app.route('/order/<int:order_id>')
 def order_confirmation(order_id):
-    order = Order.query.get(order_id)
+    # Items (with their products) arrive in one extra SELECT ... IN rather than a hand-built tuple join
+    order = Order.query.options(selectinload(Order.items).joinedload(OrderItem.product, innerjoin=True)).get(order_id)
     if not order:
         flash("Order not found.")
         return redirect(url_for('index'))
-
-    items_raw = db.session.query(OrderItem.quantity, OrderItem.unit_price, Product.title, Product.image_url)\
-        .join(Product, OrderItem.product_id == Product.id)\
-        .filter(OrderItem.order_id == order_id)\
-        .all()
-    items = [dict(row._mapping) for row in items_raw]
     
-    return render_template('order_confirmation.html', order=order, items=items)
+    return render_template('order_confirmation.html', order=order)
 
 # --- Address suggestions API: returns saved addresses for user ---
 @app.route('/addresses')
@@ -943,14 +1320,20 @@ def address_suggestions():
     if 'user_id' not in session:
         return jsonify([])
 
-    q = request.args.get('query', '').strip()
-    query = Address.query.filter_by(user_id=session['user_id'])
-    
+    user_id = session['user_id']
+    q = request.args.get('query', '').strip()[:64]
+    results = cache_get_or_set(f'addresses:{user_id}:{q}', 60, lambda: _address_results(user_id, q))
+    return jsonify(results)
+
+def _address_results(user_id, q):
+    """Saved addresses for user_id starting with q, newest first (max 8)."""
+    # Prefix match so the (user_id, address_text) unique index can bound the scan
+    query = db.session.query(Address.id, Address.label, Address.address_text)\
+        .filter(Address.user_id == user_id)
     if q:
-        query = query.filter(Address.address_text.like(f'%{q}%'))
-    
-    addresses = query.order_by(desc(Address.created_at)).limit(8).all()
-    return jsonify([{"id": a.id, "label": a.label, "address": a.address_text} for a in addresses])
+        query = query.filter(Address.address_text.startswith(q, autoescape=True))
+    rows = query.order_by(desc(Address.created_at)).limit(8).all()
+    return [{"id": r.id, "label": r.label, "address": r.address_text} for r in rows]
 
 # --- Seller profile route: shows seller info and their products ---
 @app.route('/seller/<int:seller_id>')
@@ -962,26 +1345,34 @@ def seller_profile(seller_id):
 
     return render_template('seller_profile.html', seller=seller, products=products)
 
-# --- Favicon route: serves favicon from available static assets ---
-@app.route('/favicon.ico')
-def favicon():
-    """Serve a favicon even if favicon.ico isn't present.
+def _resolve_favicon():
+    """Pick the favicon file once, returning (path, mimetype) or (None, None).
     Priority:
       1) static/img/logo.png (PNG)
       2) static/favicon.png (PNG)
       3) static/favicon.ico (ICO)
     """
-    # Paths
-    logo_png = os.path.join(app.root_path, 'static', 'img', 'logo.png')
-    png_path = os.path.join(app.root_path, 'static', 'favicon.png')
-    ico_path = os.path.join(app.root_path, 'static', 'favicon.ico')
-
-    if os.path.exists(logo_png):
-        return send_file(logo_png, mimetype='image/png')
-    if os.path.exists(png_path):
-        return send_file(png_path, mimetype='image/png')
-    if os.path.exists(ico_path):
-        return send_file(ico_path, mimetype='image/x-icon')
+    candidates = [
+        (os.path.join(app.root_path, 'static', 'img', 'logo.png'), 'image/png'),
+        (os.path.join(app.root_path, 'static', 'favicon.png'), 'image/png'),
+        (os.path.join(app.root_path, 'static', 'favicon.ico'), 'image/x-icon'),
+    ]
+    for path, mimetype in candidates:
+        if os.path.exists(path):
+            return path, mimetype
+    return None, None
+
+# Resolved at import so the route doesn't stat() the candidates on every request
+FAVICON_PATH, FAVICON_MIME = _resolve_favicon()
+FAVICON_MAX_AGE = 604800  # browsers/CDNs may reuse the icon for a week, then revalidate via ETag/Last-Modified
+
+# --- Favicon route: serves favicon from available static assets ---
+@app.route('/favicon.ico')
+def favicon():
+    """Serve a favicon even if favicon.ico isn't present."""
+    if FAVICON_PATH:
+        # conditional=True answers If-None-Match / If-Modified-Since with a bodyless 304
+        return send_file(FAVICON_PATH, mimetype=FAVICON_MIME, conditional=True, max_age=FAVICON_MAX_AGE)
     # If nothing exists, return 204 No Content to avoid 404 noise
     return ('', 204)
 
@@ -990,7 +1381,7 @@ def favicon():
 @login_required
 def post_ad():
     # Check if user is a seller
-    user = User.query.get(session.get('user_id'))
+    user = _current_user()
     
     if not user or not user.is_seller:
         flash("You must be a seller to post ads. Please contact support to become a seller.", "warning")
@@ -1081,6 +1472,7 @@ def post_ad():
         )
         db.session.add(new_product)
         db.session.commit()
+        invalidate_product_caches()
         
         if is_boat_category:
             flash("Boat listing posted as an auction (boats are auction-only).", "success")
@@ -1097,27 +1489,39 @@ def post_ad():
 @login_required
 def admin_convert_boats():
     # Simple admin utility to convert existing boat listings into auctions
-    user = User.query.get(session.get('user_id'))
+    user = _current_user()
     if not user or not user.is_admin:
         flash('Admin access required.', 'danger')
         return redirect(url_for('index'))
     boat_categories = ["Sailboats", "Powerboats", "Dinghies"]
     now = datetime.utcnow()
-    changes = 0
-    products = Product.query.filter(Product.category.in_(boat_categories), Product.is_auction == 0).all()
-    for p in products:
-        p.is_auction = 1
-        # Use existing price as starting bid if no starting bid
-        if not p.starting_bid:
-            p.starting_bid = p.price if p.price else 1.0
-        if not p.current_bid:
-            p.current_bid = p.starting_bid
-        # If auction_end not set or in past, set 7 days from now
-        if not p.auction_end or p.auction_end < now:
-            p.auction_end = now + timedelta(days=7)
-        changes += 1
+    # One set-based UPDATE; every SET expression sees the row's old values, so the
+    # starting bid fallback is repeated for current_bid rather than read back
+    starting_bid = func.coalesce(func.nullif(Product.price, 0), 1.0)
+    result = db.session.execute(
+        update(Product)
+        .where(Product.category.in_(boat_categories), Product.is_auction == 0)
+        .values(
+            is_auction=1,
+            # Use existing price as starting bid if no starting bid
+            starting_bid=func.coalesce(func.nullif(Product.starting_bid, 0), starting_bid),
+            current_bid=func.coalesce(
+                func.nullif(Product.current_bid, 0),
+                func.nullif(Product.starting_bid, 0),
+                starting_bid
+            ),
+            # If auction_end not set or in past, set 7 days from now
+            auction_end=case(
+                (or_(Product.auction_end.is_(None), Product.auction_end < now), now + timedelta(days=7)),
+                else_=Product.auction_end
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    changes = result.rowcount
     if changes:
         db.session.commit()
+        invalidate_product_caches()
         flash(f'Converted {changes} boat listings to auctions.', 'success')
     else:
         flash('No boat listings required conversion.', 'info')
@@ -1129,13 +1533,20 @@ def admin_convert_boats():
 def my_listings():
     # Show products posted by the current user (if they're a seller)
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     
     if not user or not user.is_seller:
         flash("You must be a seller to view listings.", "warning")
         return redirect(url_for('index'))
     
-    products = Product.query.filter_by(seller_id=user_id).order_by(desc(Product.created_at)).all()
+    # Only the columns the cards show; the description is cut to 101 chars in SQL since the template
+    # shows 100 and only needs to know whether there was more
+    products = db.session.query(
+        Product.id, Product.title, Product.price, Product.stock, Product.image_url,
+        Product.category, Product.created_at, func.substr(Product.description, 1, 101).label('description')
+    ).filter(Product.seller_id == user_id)\
+     .order_by(desc(Product.created_at))\
+     .all()
     
     return render_template('my_listings.html', products=products)
 
@@ -1145,7 +1556,7 @@ def my_listings():
 def settings():
     """User settings page with password change"""
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     return render_template('edit_profile.html', user=user)
 
 @app.route('/settings/update', methods=['POST'])
@@ -1153,7 +1564,7 @@ def settings():
 def update_settings():
     """Handle settings updates"""
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     
     # Handle password change
     current_password = request.form.get('current_password', '').strip()
@@ -1166,7 +1577,7 @@ def update_settings():
             flash("Please enter your current password.", "danger")
             return redirect(url_for('settings'))
         
-        if not check_password_hash(user.password_hash, current_password):
+        if not verify_password(user, current_password):
             flash("Current password is incorrect.", "danger")
             return redirect(url_for('settings'))
         
@@ -1183,7 +1594,7 @@ def update_settings():
             return redirect(url_for('settings'))
         
         # Update password
-        user.password_hash = generate_password_hash(new_password)
+        user.password_hash = hash_password(new_password)
         db.session.commit()
         flash("Password updated successfully!", "success")
         return redirect(url_for('settings'))
@@ -1207,18 +1618,20 @@ def update_settings():
 def profile():
     """View user's own profile"""
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     
     # Get user's stats if seller
     stats = None
     if user.is_seller:
-        products = Product.query.filter_by(seller_id=user_id).all()
-        total_products = len(products)
-        active_products = len([p for p in products if hasattr(p, 'status') and p.status == 'available'])
+        # Products have no status column; "active" means in stock, same as the landing page's active_listings
+        counts = db.session.query(
+            func.count(Product.id).label('total'),
+            func.sum(case((Product.stock > 0, 1), else_=0)).label('active')
+        ).filter(Product.seller_id == user_id).one()
         
         stats = {
-            'total_products': total_products,
-            'active_products': active_products,
+            'total_products': counts.total,
+            'active_products': counts.active or 0,
             'rating': user.rating or 0,
             'total_sales': user.total_sales or 0
         }
@@ -1229,14 +1642,15 @@ def profile():
 @app.route('/admin')
 @admin_required
 def admin_index():
-    stats = {
-        'products_count': Product.query.count(),
-        'users_count': User.query.count(),
-        'orders_count': Order.query.count(),
-        'pending_reviews': Review.query.filter_by(is_approved=0).count(),
-        'approved_reviews': Review.query.filter_by(is_approved=1).count(),
-        'total_reviews': Review.query.count()
-    }
+    # All counters in one round trip; cached briefly since the dashboard doesn't need live numbers
+    stats = cache_get_or_set('admin:stats', 30, lambda: dict(db.session.query(
+        select(func.count(Product.id)).scalar_subquery().label('products_count'),
+        select(func.count(User.id)).scalar_subquery().label('users_count'),
+        select(func.count(Order.id)).scalar_subquery().label('orders_count'),
+        select(func.count(Review.id)).where(Review.is_approved == 0).scalar_subquery().label('pending_reviews'),
+        select(func.count(Review.id)).where(Review.is_approved == 1).scalar_subquery().label('approved_reviews'),
+        select(func.count(Review.id)).scalar_subquery().label('total_reviews')
+    ).one()._mapping))
     return render_template('admin/dashboard.html', stats=stats)
 
 # --- Admin reviews management routes ---
@@ -1245,13 +1659,8 @@ def admin_index():
 def admin_reviews():
     filter_status = request.args.get('status', 'pending')  # pending, approved, all
     
-    query = db.session.query(
-        Review,
-        User.username.label('reviewer_name'),
-        Product.id.label('product_id'),
-        Product.title.label('product_name')
-    ).join(User, Review.user_id == User.id)\
-     .join(Product, Review.product_id == Product.id)
+    # Reviewer and product come back in the same SELECT via joined eager loading
+    query = Review.query.options(joinedload(Review.user, innerjoin=True), joinedload(Review.product, innerjoin=True))
     
     if filter_status == 'pending':
         query = query.filter(Review.is_approved == 0).order_by(desc(Review.created_at))
@@ -1260,17 +1669,7 @@ def admin_reviews():
     else:  # all
         query = query.order_by(desc(Review.created_at))
     
-    reviews_raw = query.all()
-    # Convert to list of tuples/dicts for easier template access
-    reviews = []
-    for row in reviews_raw:
-        review_obj = row[0]  # The Review object
-        reviews.append({
-            'review': review_obj,
-            'reviewer_name': row.reviewer_name,
-            'product_id': row.product_id,
-            'product_name': row.product_name
-        })
+    reviews = query.all()
     return render_template('admin/reviews.html', reviews=reviews, filter_status=filter_status)
 
 @app.route('/admin/reviews/<int:review_id>/approve', methods=['POST'])
@@ -1281,6 +1680,7 @@ def admin_review_approve(review_id):
         review.is_approved = 1
         review.approved_at = datetime.utcnow()
         db.session.commit()
+        cache_invalidate('admin:')
         flash('Review approved successfully.')
     return redirect(url_for('admin_reviews'))
 
@@ -1291,6 +1691,7 @@ def admin_review_reject(review_id):
     if review:
         db.session.delete(review)
         db.session.commit()
+        cache_invalidate('admin:')
         flash('Review rejected and deleted.')
     return redirect(url_for('admin_reviews'))
 
@@ -1305,29 +1706,31 @@ def admin_orders():
 @app.route('/admin/orders/<int:order_id>')
 @admin_required
 def admin_order_detail(order_id):
-    order = Order.query.get(order_id)
+    order = Order.query.options(selectinload(Order.items).joinedload(OrderItem.product, innerjoin=True)).get(order_id)
     if not order:
         flash("Order not found.")
         return redirect(url_for('admin_orders'))
-
-    items_raw = db.session.query(OrderItem.quantity, OrderItem.unit_price, Product.title, Product.image_url)\
-        .join(Product, OrderItem.product_id == Product.id)\
-        .filter(OrderItem.order_id == order_id)\
-        .all()
-    items = [dict(row._mapping) for row in items_raw]
-    return render_template('admin/order_detail.html', order=order, items=items)
+    return render_template('admin/order_detail.html', order=order)
 
 # --- Admin product management routes ---
 @app.route('/admin/products')
 @admin_required
 def admin_products():
-    products_raw = db.session.query(Product.id, Product.title, Product.price, Product.stock, User.username.label('seller'))\
-        .outerjoin(User, Product.seller_id == User.id)\
-        .order_by(Product.created_at.desc())\
-        .all()
-    products = [dict(row._mapping) for row in products_raw]
+    # Cached under the 'products:' prefix, so every product write (via invalidate_product_caches) drops it
+    products = cache_get_or_set('products:admin-list', 60, lambda: [row._mapping for row in db.session.query(
+        Product.id, Product.title, Product.price, Product.stock, User.username.label('seller')
+    ).outerjoin(User, Product.seller_id == User.id)\
+     .order_by(Product.created_at.desc())\
+     .all()])
     return render_template('admin/products.html', products=products)
 
+def get_seller_options():
+    """(id, username) rows for the admin product form's seller dropdown, cached briefly.
+    Cleared via the 'users:' prefix whenever a user is created or deleted."""
+    return cache_get_or_set('users:seller-options', 60, lambda: db.session.execute(
+        select(User.id, User.username).order_by(User.username)
+    ).all())
+
 @app.route('/admin/products/new', methods=['GET', 'POST'])
 @admin_required
 def admin_product_new():
@@ -1369,20 +1772,16 @@ def admin_product_new():
         )
         db.session.add(new_product)
         db.session.commit()
+        invalidate_product_caches()
         flash("Product created.")
         return redirect(url_for('admin_products'))
     # GET
-    sellers = User.query.order_by(User.username).all()
+    sellers = get_seller_options()
     return render_template('admin/product_form.html', sellers=sellers, product=None)
 
 @app.route('/admin/products/<int:product_id>/edit', methods=['GET', 'POST'])
 @admin_required
 def admin_product_edit(product_id):
-    product = Product.query.get(product_id)
-    if not product:
-        flash("Product not found.")
-        return redirect(url_for('admin_products'))
-    
     if request.method == 'POST':
         title = request.form.get('title','').strip()
         description = request.form.get('description','').strip()
@@ -1401,27 +1800,43 @@ def admin_product_edit(product_id):
         if image_url and not (image_url.startswith('http://') or image_url.startswith('https://') or image_url.startswith('/')):
             image_url = f"/static/img/{image_url}"
 
-        product.seller_id = seller_id
-        product.title = title
-        product.description = description
-        product.price = price_val
-        product.stock = stock_val
-        product.category = category
         crop_x = request.form.get('crop_x')
         crop_y = request.form.get('crop_y')
         crop_width = request.form.get('crop_width')
         crop_height = request.form.get('crop_height')
+        values = {
+            'seller_id': seller_id,
+            'title': title,
+            'description': description,
+            'price': price_val,
+            'stock': stock_val,
+            'category': category,
+            'crop_x': float(crop_x) if crop_x else None,
+            'crop_y': float(crop_y) if crop_y else None,
+            'crop_width': float(crop_width) if crop_width else None,
+            'crop_height': float(crop_height) if crop_height else None,
+        }
         if image_url is not None:
-            product.image_url = image_url
-        product.crop_x = float(crop_x) if crop_x else None
-        product.crop_y = float(crop_y) if crop_y else None
-        product.crop_width = float(crop_width) if crop_width else None
-        product.crop_height = float(crop_height) if crop_height else None
+            values['image_url'] = image_url
+        # Write straight away (no load of the product first); rowcount 0 means it doesn't exist
+        result = db.session.execute(
+            update(Product).where(Product.id == product_id).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            flash("Product not found.")
+            return redirect(url_for('admin_products'))
         db.session.commit()
+        invalidate_product_caches()
         flash("Product updated.")
         return redirect(url_for('admin_products'))
     # GET form
-    sellers = User.query.order_by(User.username).all()
+    product = db.session.get(Product, product_id)
+    if not product:
+        flash("Product not found.")
+        return redirect(url_for('admin_products'))
+    sellers = get_seller_options()
     return render_template('admin/product_form.html', product=product, sellers=sellers)
 
 @app.route('/admin/products/<int:product_id>/delete', methods=['POST'])
@@ -1431,6 +1846,7 @@ def admin_product_delete(product_id):
     if product:
         db.session.delete(product)
         db.session.commit()
+        invalidate_product_caches()
     flash("Product deleted.")
     return redirect(url_for('admin_products'))
 
@@ -1444,12 +1860,16 @@ def admin_users():
 @app.route('/admin/users/<int:user_id>/toggle_admin', methods=['POST'])
 @admin_required
 def admin_user_toggle_admin(user_id):
-    user = User.query.get(user_id)
-    if not user:
+    # Flip the flag inside one UPDATE so concurrent toggles can't read a stale value; RETURNING tells us the row existed
+    new_flag = db.session.execute(
+        update(User).where(User.id == user_id)
+        .values(is_admin=case((User.is_admin == 1, 0), else_=1))
+        .returning(User.is_admin)
+    ).scalar()
+    if new_flag is None:
         flash("User not found.")
         return redirect(url_for('admin_users'))
     
-    user.is_admin = not user.is_admin
     db.session.commit()
     flash("User admin status updated.")
     return redirect(url_for('admin_users'))
@@ -1458,16 +1878,19 @@ def admin_user_toggle_admin(user_id):
 @app.route('/admin/users/<int:user_id>/toggle_seller', methods=['POST'])
 @admin_required
 def admin_user_toggle_seller(user_id):
-    user = User.query.get(user_id)
-    if not user:
+    new_flag = db.session.execute(
+        update(User).where(User.id == user_id)
+        .values(is_seller=case((User.is_seller == 1, 0), else_=1))
+        .returning(User.is_seller)
+    ).scalar()
+    if new_flag is None:
         flash("User not found.")
         return redirect(url_for('admin_users'))
     
-    user.is_seller = not user.is_seller
     db.session.commit()
     flash("User seller status updated.")
     # if we just promoted them to seller, send admin to the seller details form to fill info
-    if user.is_seller:
+    if new_flag:
         return redirect(url_for('admin_edit_seller', user_id=user_id))
     return redirect(url_for('admin_users'))
 
@@ -1475,11 +1898,6 @@ def admin_user_toggle_seller(user_id):
 @app.route('/admin/users/<int:user_id>/seller', methods=['GET', 'POST'])
 @admin_required
 def admin_edit_seller(user_id):
-    user = User.query.get(user_id)
-    if not user:
-        flash("User not found.")
-        return redirect(url_for('admin_users'))
-
     if request.method == 'POST':
         business_name = request.form.get('business_name','').strip() or None
         seller_description = request.form.get('seller_description','').strip() or None
@@ -1492,16 +1910,24 @@ def admin_edit_seller(user_id):
         except ValueError:
             total_sales = 0
 
-        # ensure user is marked as seller
-        user.business_name = business_name
-        user.seller_description = seller_description
-        user.rating = rating
-        user.total_sales = total_sales
-        user.is_seller = True
+        # ensure user is marked as seller; a single UPDATE, with RETURNING standing in for the existence check
+        updated_id = db.session.execute(
+            update(User).where(User.id == user_id)
+            .values(business_name=business_name, seller_description=seller_description,
+                    rating=rating, total_sales=total_sales, is_seller=1)
+            .returning(User.id)
+        ).scalar()
+        if updated_id is None:
+            flash("User not found.")
+            return redirect(url_for('admin_users'))
         db.session.commit()
         flash("Seller details updated.")
         return redirect(url_for('admin_users'))
 
+    user = db.session.get(User, user_id)
+    if not user:
+        flash("User not found.")
+        return redirect(url_for('admin_users'))
     return render_template('admin/seller_form.html', user=user)
 
 @app.route('/admin/users/<int:user_id>/delete', methods=['POST'])
@@ -1516,6 +1942,9 @@ def admin_user_delete(user_id):
     if user:
         db.session.delete(user)
         db.session.commit()
+        cache_invalidate('users:')
+        # their listings were deleted with them
+        invalidate_product_caches()
     flash("User deleted.")
     return redirect(url_for('admin_users'))
 
@@ -1524,28 +1953,28 @@ def admin_user_delete(user_id):
 @login_required
 def favorites():
     user_id = session.get('user_id')
-    products_raw = db.session.query(Product.id, Product.title, Product.description, Product.price, 
-                                Product.stock, Product.image_url, Product.category,
-                                User.business_name, User.rating, Product.seller_id)\
-        .join(Favorite, Favorite.product_id == Product.id)\
-        .outerjoin(User, Product.seller_id == User.id)\
-        .filter(Favorite.user_id == user_id)\
+    # Favorites come back with their products in one joined SELECT, limited to the columns the cards use
+    favorites = Favorite.query.filter_by(user_id=user_id)\
+        .options(joinedload(Favorite.product, innerjoin=True)
+                 .load_only(Product.id, Product.title, Product.price, Product.image_url))\
         .order_by(Favorite.created_at.desc())\
         .all()
-    products = [dict(row._mapping) for row in products_raw]
-    return render_template('favorites.html', products=products)
+    return render_template('favorites.html', favorites=favorites)
 
 @app.route('/favorites/add/<int:product_id>', methods=['POST'])
 @login_required
 def add_favorite(product_id):
     user_id = session.get('user_id')
-    try:
-        new_fav = Favorite(user_id=user_id, product_id=product_id)
-        db.session.add(new_fav)
-        db.session.commit()
+    # A duplicate is skipped by the unique (user_id, product_id) constraint; rowcount tells which case it was
+    result = db.session.execute(
+        sqlite_insert(Favorite)
+        .values(user_id=user_id, product_id=product_id)
+        .on_conflict_do_nothing(index_elements=['user_id', 'product_id'])
+    )
+    db.session.commit()
+    if result.rowcount:
         flash("Added to favorites!", "success")
-    except IntegrityError:
-        db.session.rollback()
+    else:
         flash("Already in favorites.", "info")
     return redirect(request.referrer or url_for('products'))
 
@@ -1570,13 +1999,14 @@ def forgot_password():
         user = User.query.filter_by(email=email).first()
         
         if user:
-            import secrets
-            from datetime import datetime, timedelta
             token = secrets.token_urlsafe(32)
             expires = datetime.utcnow() + timedelta(hours=1)
             
             reset_token = PasswordResetToken(user_id=user.id, token=token, expires_at=expires)
             db.session.add(reset_token)
+            # Purge expired tokens while we're writing anyway, so the table stays small
+            PasswordResetToken.query.filter(PasswordResetToken.expires_at < datetime.utcnow())\
+                .delete(synchronize_session=False)
             db.session.commit()
             # In production, send email with reset link
             reset_link = url_for('reset_password', token=token, _external=True)
@@ -1589,9 +2019,8 @@ def forgot_password():
 
 @app.route('/reset-password/<token>', methods=['GET', 'POST'])
 def reset_password(token):
-    from datetime import datetime
-    
-    reset = PasswordResetToken.query.filter(
+    # The user row comes back with the token, so the POST below needs no second lookup
+    reset = PasswordResetToken.query.options(joinedload(PasswordResetToken.user)).filter(
         PasswordResetToken.token == token,
         PasswordResetToken.expires_at > datetime.utcnow()
     ).first()
@@ -1606,9 +2035,7 @@ def reset_password(token):
             flash("Password is too weak. Use at least 8 characters including uppercase, lowercase, a number, and a symbol.", "danger")
             return redirect(url_for('reset_password', token=token))
         
-        pw_hash = generate_password_hash(password)
-        user = User.query.get(reset.user_id)
-        user.password_hash = pw_hash
+        reset.user.password_hash = hash_password(password)
         
         db.session.delete(reset)
         db.session.commit()
@@ -1618,31 +2045,38 @@ def reset_password(token):
     return render_template('reset_password.html', token=token)
 
 # --- Notification routes ---
+NOTIFICATIONS_LIMIT = 50
+
 @app.route('/notifications')
 @login_required
 def notifications():
     user_id = session.get('user_id')
-    notifs = Notification.query.filter_by(user_id=user_id)\
-        .order_by(Notification.created_at.desc())\
-        .limit(50)\
-        .all()
+    # Plain column rows: the JSON feed and the page only read these fields, so no ORM objects are built
+    notifs = db.session.execute(
+        select(Notification.id, Notification.message, Notification.link, Notification.is_read, Notification.created_at)
+        .where(Notification.user_id == user_id)
+        .order_by(Notification.created_at.desc())
+        .limit(NOTIFICATIONS_LIMIT)
+    ).all()
     
     # If AJAX request, return JSON without marking as read
     if request.headers.get('Accept') == 'application/json' or request.args.get('json') == '1':
-        return jsonify({'notifications': [{'id': n.id, 'message': n.message, 'link': n.link, 
-                                          'is_read': n.is_read, 'created_at': n.created_at.isoformat()} 
-                                         for n in notifs]})
-    
-    # Mark as read for full page view
-    Notification.query.filter_by(user_id=user_id, is_read=False).update({'is_read': True})
-    db.session.commit()
+        payload = {'notifications': [{'id': n.id, 'message': n.message, 'link': n.link,
+                                      'is_read': n.is_read, 'created_at': n.created_at.isoformat()}
+                                     for n in notifs]}
+        return app.response_class(_json_dumps(payload), mimetype='application/json')
+    
+    # Mark as read for full page view; skipped when nothing is unread (if the list was cut off at the
+    # limit, older rows may still be unread, so the UPDATE runs then regardless)
+    if len(notifs) == NOTIFICATIONS_LIMIT or any(not n.is_read for n in notifs):
+        Notification.query.filter_by(user_id=user_id, is_read=False).update({'is_read': True})
+        db.session.commit()
     return render_template('notifications.html', notifications=notifs)
 
 def create_notification(user_id, message, link=None):
-    """Helper to create a notification for a user."""
+    """Helper to create a notification for a user; it is saved with the caller's next commit."""
     notif = Notification(user_id=user_id, message=message, link=link)
     db.session.add(notif)
-    db.session.commit()
 
 # --- Product reporting route ---
 @app.route('/product/<int:product_id>/report', methods=['POST'])
@@ -1693,96 +2127,143 @@ def seller_dashboard():
     user_id = session.get('user_id')
     
     # Check if user is a seller
-    user = User.query.get(user_id)
+    user = _current_user()
     if not user or not user.is_seller:
         flash("Seller access required.", "warning")
         return redirect(url_for('index'))
     
-    # Get stats
-    product_count = Product.query.filter_by(seller_id=user_id).count()
-    
-    order_stats = db.session.query(
-        func.count(func.distinct(Order.id)).label('count'),
-        func.coalesce(func.sum(Order.total), 0).label('revenue')
-    ).join(OrderItem, OrderItem.order_id == Order.id)\
-     .join(Product, OrderItem.product_id == Product.id)\
-     .filter(Product.seller_id == user_id)\
-     .first()
-    
-    # Top products
-    top_products_raw = db.session.query(
-        Product.id, Product.title,
-        func.sum(OrderItem.quantity).label('sold'),
-        func.sum(OrderItem.quantity * OrderItem.unit_price).label('revenue')
-    ).join(OrderItem, OrderItem.product_id == Product.id)\
+    # Per-product sales in one pass over the seller's products; product count, top sellers and
+    # top-per-category are all derived from these rows instead of re-running the join for each
+    product_rows = db.session.query(
+        Product.id, Product.title, Product.category, Product.price, Product.image_url, Product.view_count,
+        func.coalesce(func.sum(OrderItem.quantity), 0).label('total_sold'),
+        func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0).label('category_revenue')
+    ).outerjoin(OrderItem, OrderItem.product_id == Product.id)\
      .filter(Product.seller_id == user_id)\
      .group_by(Product.id)\
-     .order_by(desc('sold'))\
-     .limit(5)\
      .all()
-    top_products = [dict(row._mapping) for row in top_products_raw]
+    product_count = len(product_rows)
     
-    # Recent orders
-    recent_orders_raw = db.session.query(Order.id, Order.buyer_name, Order.total, Order.status, Order.created_at)\
-        .join(OrderItem, OrderItem.order_id == Order.id)\
-        .join(Product, OrderItem.product_id == Product.id)\
-        .filter(Product.seller_id == user_id)\
-        .group_by(Order.id)\
-        .order_by(Order.created_at.desc())\
-        .limit(10)\
-        .all()
-    recent_orders = [dict(row._mapping) for row in recent_orders_raw]
+    # Top products
+    top_products = [
+        {'id': row.id, 'title': row.title, 'sold': row.total_sold, 'revenue': row.category_revenue}
+        for row in sorted((r for r in product_rows if r.total_sold), key=lambda r: (r.total_sold, r.category_revenue), reverse=True)[:5]
+    ]
     
     # Top product per category (simplified version)
-    top_by_category_raw = db.session.query(
-        Product.category, Product.id, Product.title, Product.price, Product.image_url, Product.view_count,
-        func.coalesce(func.sum(OrderItem.quantity), 0).label('total_sold'),
-        func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0).label('category_revenue')
-    ).outerjoin(OrderItem, OrderItem.product_id == Product.id)\
-     .filter(Product.seller_id == user_id, Product.category.isnot(None))\
-     .group_by(Product.category, Product.id)\
-     .order_by(desc('category_revenue'))\
+    top_by_category = [row._mapping for row in sorted(
+        (r for r in product_rows if r.category is not None), key=lambda r: r.category_revenue, reverse=True
+    )]
+    
+    # Recent orders, with the totals over all of the seller's orders carried on each row by window functions
+    seller_order_ids = select(OrderItem.order_id)\
+        .join(Product, OrderItem.product_id == Product.id)\
+        .where(Product.seller_id == user_id)
+    recent_orders_raw = db.session.query(
+        Order.id, Order.buyer_name, Order.total, Order.status, Order.created_at,
+        func.count().over().label('order_count'),
+        func.coalesce(func.sum(Order.total).over(), 0).label('order_revenue')
+    ).filter(Order.id.in_(seller_order_ids))\
+     .order_by(Order.created_at.desc())\
+     .limit(10)\
      .all()
-    top_by_category = [dict(row._mapping) for row in top_by_category_raw]
+    recent_orders = [row._mapping for row in recent_orders_raw]
+    order_count = recent_orders_raw[0].order_count if recent_orders_raw else 0
+    revenue = recent_orders_raw[0].order_revenue if recent_orders_raw else 0
     
     return render_template('seller_dashboard.html', 
                          user=user,
                          product_count=product_count,
-                         order_count=order_stats.count,
-                         revenue=order_stats.revenue,
+                         order_count=order_count,
+                         revenue=revenue,
                          top_products=top_products,
                          recent_orders=recent_orders,
                          top_by_category=top_by_category)
 
 # --- Recently viewed products tracking and route ---
+# View counts and anonymous view rows are buffered in memory and written in batches;
+# logged-in views are still written immediately so "recently viewed" stays current.
+VIEW_FLUSH_SIZE = 32
+VIEW_FLUSH_SECONDS = 5
+VIEW_HISTORY_LIMIT = 50
+VIEW_PRUNE_PROBABILITY = 0.02
+_view_lock = threading.Lock()
+_pending_view_counts = Counter()
+_pending_anonymous_views = []
+_pending_views_since = None
+
+def flush_product_views(force=False):
+    """Write buffered view counts and anonymous views in one transaction once the batch is due."""
+    global _pending_views_since
+    with _view_lock:
+        if not _pending_view_counts:
+            return
+        due = sum(_pending_view_counts.values()) >= VIEW_FLUSH_SIZE or \
+            time.monotonic() - _pending_views_since >= VIEW_FLUSH_SECONDS
+        if not (force or due):
+            return
+        counts = dict(_pending_view_counts)
+        views = list(_pending_anonymous_views)
+        _pending_view_counts.clear()
+        _pending_anonymous_views.clear()
+        _pending_views_since = None
+    products_table = Product.__table__
+    # Own connection and transaction, so nothing pending on the request's session gets committed with it
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(products_table)
+                .where(products_table.c.id == bindparam('pid'))
+                .values(view_count=func.coalesce(products_table.c.view_count, 0) + bindparam('n')),
+                [{'pid': pid, 'n': n} for pid, n in counts.items()]
+            )
+            if views:
+                conn.execute(insert(ProductView.__table__), views)
+    except Exception:
+        app.logger.exception("Failed to flush %d buffered product view counts", sum(counts.values()))
+
+@app.after_request
+def flush_product_views_after_request(response):
+    flush_product_views()
+    return response
+
+@atexit.register
+def flush_product_views_at_exit():
+    with app.app_context():
+        flush_product_views(force=True)
+
 def track_product_view(product_id):
     """Helper to track when a product is viewed."""
+    global _pending_views_since
     user_id = session.get('user_id')
     
-    # Delete any existing view records for this user and product to avoid duplicates
-    if user_id:
-        ProductView.query.filter_by(user_id=user_id, product_id=product_id).delete()
-    
-    # Insert new view record (this will be the most recent)
-    new_view = ProductView(user_id=user_id, product_id=product_id)
-    db.session.add(new_view)
+    # Queue the view count increment (and the view row for anonymous visitors)
+    with _view_lock:
+        if _pending_views_since is None:
+            _pending_views_since = time.monotonic()
+        _pending_view_counts[product_id] += 1
+        if not user_id:
+            _pending_anonymous_views.append({'user_id': None, 'product_id': product_id, 'viewed_at': datetime.utcnow()})
+    if not user_id:
+        return
     
-    # Increment view count
-    product = Product.query.get(product_id)
-    if product:
-        product.view_count = (product.view_count or 0) + 1
+    # One upsert per view: the unique (user_id, product_id) index turns a repeat view into a timestamp bump
+    now = datetime.utcnow()
+    db.session.execute(
+        sqlite_insert(ProductView)
+        .values(user_id=user_id, product_id=product_id, viewed_at=now)
+        .on_conflict_do_update(index_elements=['user_id', 'product_id'], set_={'viewed_at': now})
+    )
     
-    # Clean up old views (keep last 50 per user)
-    if user_id:
-        # Get IDs of old views to delete
-        old_views = db.session.query(ProductView.id)\
-            .filter(ProductView.user_id == user_id)\
+    # Clean up old views (keep last VIEW_HISTORY_LIMIT per user); only every ~50th view pays for it
+    if random.random() < VIEW_PRUNE_PROBABILITY:
+        stale_ids = select(ProductView.id)\
+            .where(ProductView.user_id == user_id)\
             .order_by(desc(ProductView.viewed_at))\
-            .offset(50)\
-            .all()
-        old_view_ids = [v.id for v in old_views]
-        if old_view_ids:
-            ProductView.query.filter(ProductView.id.in_(old_view_ids)).delete(synchronize_session=False)
+            .offset(VIEW_HISTORY_LIMIT)
+        db.session.execute(
+            ProductView.__table__.delete().where(ProductView.id.in_(stale_ids))
+        )
     
     db.session.commit()
 
@@ -1793,14 +2274,22 @@ def recently_viewed():
         flash("Please log in to see your recently viewed products.", "info")
         return redirect(url_for('login'))
     
+    # Latest view per product first (one aggregate pass over the user's views), then join products once
+    last_seen = db.session.query(
+        ProductView.product_id,
+        func.max(ProductView.viewed_at).label('viewed_at')
+    ).filter(ProductView.user_id == user_id)\
+     .group_by(ProductView.product_id)\
+     .subquery()
+    
     # Show in-stock items first, then out-of-stock
-    products = db.session.query(Product, ProductView.viewed_at)\
-        .join(ProductView, ProductView.product_id == Product.id)\
-        .filter(ProductView.user_id == user_id)\
-        .distinct(Product.id)\
-        .order_by(desc(Product.stock > 0), desc(ProductView.viewed_at))\
-        .limit(20)\
-        .all()
+    products_raw = db.session.query(
+        Product.id, Product.title, Product.price, Product.stock, Product.image_url, last_seen.c.viewed_at
+    ).join(last_seen, last_seen.c.product_id == Product.id)\
+     .order_by(desc(Product.stock > 0), desc(last_seen.c.viewed_at))\
+     .limit(20)\
+     .all()
+    products = [row._mapping for row in products_raw]
     
     return render_template('recently_viewed.html', products=products)
 
@@ -1825,22 +2314,27 @@ def auctions():
     elif category:
         base_query = base_query.filter(Product.category == category)
 
-    active_auctions = base_query.order_by(Product.auction_end.asc()).all()
     # Ending soon subset (within next 24h)
     soon_threshold = now + timedelta(hours=24)
-    ending_soon = [a for a in active_auctions if a.auction_end <= soon_threshold]
-
     if ending_filter:
-        # Narrow to only ending soon if requested
-        active_auctions = ending_soon
-
-    # Distinct auction categories for filter dropdown
-    categories_rows = db.session.query(Product.category).filter(
-        Product.is_auction == 1,
-        Product.auction_end > now,
-        Product.auction_end.isnot(None)
-    ).distinct().all()
-    auction_categories = sorted([r[0] for r in categories_rows if r[0]])
+        # Narrow to only ending soon in SQL, so later-ending auctions are never loaded
+        active_auctions = base_query.filter(Product.auction_end <= soon_threshold)\
+            .order_by(Product.auction_end.asc())\
+            .all()
+        ending_soon = active_auctions
+    else:
+        # The ending-soon list is a prefix of the full list (sorted by end time), so no second query
+        active_auctions = base_query.order_by(Product.auction_end.asc()).all()
+        ending_soon = [a for a in active_auctions if a.auction_end <= soon_threshold]
+
+    # Distinct auction categories for filter dropdown (same for every visitor and filter, so cached briefly)
+    auction_categories = cache_get_or_set('products:auction-categories', 60, lambda: sorted(
+        r[0] for r in db.session.query(Product.category).filter(
+            Product.is_auction == 1,
+            Product.auction_end > now,
+            Product.auction_end.isnot(None)
+        ).distinct().all() if r[0]
+    ))
 
     return render_template('auctions.html',
                            active_auctions=active_auctions,
@@ -1886,20 +2380,30 @@ def place_bid(product_id):
         flash("Invalid bid amount.", "danger")
         return redirect(url_for('product_detail', product_id=product_id))
     
-    # Validate bid amount with $5 minimum increment
-    min_bid = (product.current_bid + 5) if product.current_bid else product.starting_bid
-    if bid_amount < min_bid:
-        flash(f"Bid must be at least ${min_bid:.2f} (minimum $5 increment)", "danger")
-        return redirect(url_for('product_detail', product_id=product_id))
+    # Validation and the price change happen in one conditional UPDATE, so two concurrent bids can't both
+    # pass the minimum-bid check; the Python checks above only pick friendlier messages for the common cases
+    now = datetime.utcnow()
+    still_open = [
+        Product.id == product_id,
+        Product.is_auction == 1,
+        or_(Product.auction_end.is_(None), Product.auction_end > now),
+    ]
     
     # Check if there's a buy now price and user wants to buy now
     if product.buy_now_price and bid_amount >= product.buy_now_price:
         # Instant win - end auction
-        product.current_bid = product.buy_now_price
-        product.auction_end = datetime.utcnow()
+        result = db.session.execute(
+            update(Product)
+            .where(*still_open, Product.buy_now_price <= bid_amount)
+            .values(current_bid=Product.buy_now_price, auction_end=now)
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            flash("This auction has ended.", "warning")
+            return redirect(url_for('product_detail', product_id=product_id))
         
-        # Mark all previous bids as not winning
-        Bid.query.filter_by(product_id=product_id).update({'is_winning': 0})
+        # Clear the previous winning flag (only the flagged row is rewritten, via ix_bids_product_winning)
+        Bid.query.filter_by(product_id=product_id, is_winning=1).update({'is_winning': 0})
         
         # Create winning bid
         winning_bid = Bid(
@@ -1910,12 +2414,40 @@ def place_bid(product_id):
         )
         db.session.add(winning_bid)
         db.session.commit()
+        invalidate_product_caches()
         
         flash(f"Congratulations! You won the auction with Buy Now at ${product.buy_now_price:.2f}!", "success")
         return redirect(url_for('product_detail', product_id=product_id))
     
-    # Mark all previous bids for this product as not winning
-    Bid.query.filter_by(product_id=product_id).update({'is_winning': 0})
+    # Validate bid amount with $5 minimum increment
+    min_bid = case(
+        (func.coalesce(Product.current_bid, 0) != 0, Product.current_bid + 5),
+        else_=Product.starting_bid
+    )
+    result = db.session.execute(
+        update(Product)
+        .where(*still_open, min_bid <= bid_amount)
+        .values(current_bid=bid_amount)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        db.session.refresh(product)
+        if product.auction_end and product.auction_end <= datetime.utcnow():
+            flash("This auction has ended.", "warning")
+        else:
+            min_bid = (product.current_bid + 5) if product.current_bid else (product.starting_bid or 0)
+            flash(f"Bid must be at least ${min_bid:.2f} (minimum $5 increment)", "danger")
+        return redirect(url_for('product_detail', product_id=product_id))
+    
+    # Previous highest bidder (if any), looked up before their bid stops being the winning one
+    previous_high_bidder = Bid.query.filter(
+        Bid.product_id == product_id,
+        Bid.user_id != user_id,
+        Bid.is_winning == 1
+    ).first()
+    
+    # Clear the previous winning flag; only the flagged row is rewritten, not the product's whole bid history
+    Bid.query.filter_by(product_id=product_id, is_winning=1).update({'is_winning': 0})
     
     # Create new bid
     new_bid = Bid(
@@ -1926,30 +2458,19 @@ def place_bid(product_id):
     )
     db.session.add(new_bid)
     
-    # Update product's current bid
-    product.current_bid = bid_amount
-    db.session.commit()
-    
-    # Notify seller
+    # Notify seller and the outbid bidder in the same transaction as the bid
     create_notification(
         product.seller_id,
         f"New bid of ${bid_amount:.2f} placed on your auction: {product.title}",
         url_for('product_detail', product_id=product_id)
     )
-    
-    # Notify previous highest bidder (if any)
-    previous_high_bidder = Bid.query.filter(
-        Bid.product_id == product_id,
-        Bid.user_id != user_id,
-        Bid.is_winning == 0
-    ).order_by(desc(Bid.bid_amount)).first()
-    
     if previous_high_bidder:
         create_notification(
             previous_high_bidder.user_id,
             f"You've been outbid on {product.title}. Current bid: ${bid_amount:.2f}",
             url_for('product_detail', product_id=product_id)
         )
+    db.session.commit()
     
     flash(f"Bid placed successfully! You are currently the highest bidder at ${bid_amount:.2f}", "success")
     return redirect(url_for('product_detail', product_id=product_id))
@@ -1996,16 +2517,19 @@ def end_auction(product_id):
     
     # End the auction
     product.auction_end = datetime.utcnow()
-    db.session.commit()
     
-    # Notify winning bidder
-    winning_bid = Bid.query.filter_by(product_id=product_id, is_winning=1).first()
+    # Notify winning bidder (committed together with the auction end). no_autoflush keeps the lookup from
+    # writing the product early, so SQLite's write lock is only taken at commit
+    with db.session.no_autoflush:
+        winning_bid = Bid.query.filter_by(product_id=product_id, is_winning=1).first()
     if winning_bid:
         create_notification(
             winning_bid.user_id,
             f"Congratulations! You won the auction for {product.title} at ${winning_bid.bid_amount:.2f}",
             url_for('product_detail', product_id=product_id)
         )
+    db.session.commit()
+    invalidate_product_caches()
     
     flash("Auction ended successfully.", "success")
     return redirect(url_for('product_detail', product_id=product_id))
@@ -2020,7 +2544,7 @@ def page_not_found(e):
 def delete_product(product_id):
     product = Product.query.get_or_404(product_id)
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     # Only allow seller or admin to delete
     if not user or (product.seller_id != user_id and not user.is_admin):
         flash('You do not have permission to delete this product.')
@@ -2028,6 +2552,7 @@ def delete_product(product_id):
     try:
         db.session.delete(product)
         db.session.commit()
+        invalidate_product_caches()
         flash('Product deleted successfully.')
     except Exception as e:
         db.session.rollback()
@@ -2038,7 +2563,7 @@ def delete_product(product_id):
 @login_required
 def update_seller_profile():
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     if not user or not user.is_seller:
         flash("Seller access required.", "warning")
         return redirect(url_for('seller_dashboard'))
@@ -2058,7 +2583,7 @@ def update_seller_profile():
 @login_required
 def edit_seller_profile():
     user_id = session.get('user_id')
-    user = User.query.get(user_id)
+    user = _current_user()
     if not user or not user.is_seller:
         flash("Seller access required.", "warning")
         return redirect(url_for('seller_dashboard'))
@@ -0,0 +1,13 @@
+# Gunicorn configuration for the webstore (used with: gunicorn -c gunicorn.conf.py wsgi:app)
+# Threaded workers let one process overlap many I/O-bound requests (SQLite queries, template
+# rendering, cookie I/O). sqlite3 releases the GIL while it waits on the database, so threads
+# give the concurrency benefit of an async worker without monkey-patching.
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 8))
+timeout = 30
+keepalive = 5
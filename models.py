@@ -7,6 +7,9 @@ db = SQLAlchemy()
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -39,6 +42,14 @@ class User(db.Model):
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ix_products_stock_created', 'stock', 'created_at'),
+        db.Index('ix_products_popular', 'stock', 'view_count', 'created_at'),
+        db.Index('ix_products_auction_end', 'is_auction', 'auction_end'),
+        db.Index('ix_products_seller_created', 'seller_id', 'created_at'),
+        db.Index('ix_products_category_stock', 'category', 'stock'),
+        db.Index('ix_products_created', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     seller_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
@@ -80,6 +91,9 @@ class Product(db.Model):
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_buyer', 'buyer_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     buyer_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
@@ -101,6 +115,10 @@ class Order(db.Model):
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
+    __table_args__ = (
+        db.Index('ix_order_items_order', 'order_id'),
+        db.Index('ix_order_items_product_order', 'product_id', 'order_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id', ondelete='CASCADE'), nullable=False)
@@ -121,6 +139,8 @@ class Review(db.Model):
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
         db.UniqueConstraint('product_id', 'user_id', name='unique_product_user_review'),
+        db.Index('ix_reviews_product_approved_created', 'product_id', 'is_approved', 'created_at'),
+        db.Index('ix_reviews_approved_created', 'is_approved', 'created_at'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -146,6 +166,7 @@ class Favorite(db.Model):
     __tablename__ = 'favorites'
     __table_args__ = (
         db.UniqueConstraint('user_id', 'product_id', name='unique_user_product_favorite'),
+        db.Index('ix_favorites_user_created', 'user_id', 'created_at'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -163,6 +184,9 @@ class Favorite(db.Model):
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_user_read_created', 'user_id', 'is_read', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -214,6 +238,10 @@ class ProductReport(db.Model):
 
 class ProductView(db.Model):
     __tablename__ = 'product_views'
+    __table_args__ = (
+        db.Index('ix_productview_user_viewed', 'user_id', 'viewed_at'),
+        db.Index('ix_productview_user_product', 'user_id', 'product_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
@@ -232,6 +260,7 @@ class Address(db.Model):
     __tablename__ = 'addresses'
     __table_args__ = (
         db.UniqueConstraint('user_id', 'address_text', name='unique_user_address'),
+        db.Index('ix_addresses_user_created', 'user_id', 'created_at'),
     )
     
     id = db.Column(db.Integer, primary_key=True)
@@ -249,6 +278,9 @@ class Address(db.Model):
 
 class Bid(db.Model):
     __tablename__ = 'bids'
+    __table_args__ = (
+        db.Index('ix_bids_product_winning', 'product_id', 'is_winning'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
@@ -263,3 +295,26 @@ class Bid(db.Model):
     
     def __repr__(self):
         return f'<Bid {self.id} - ${self.bid_amount}>'
+
+
+# Full-text search index over product text columns (SQLite FTS5, external content on `products`).
+# Triggers keep it in sync with inserts, updates, and deletes on the products table.
+PRODUCTS_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    title, description, category, content='products', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, title, description, category)
+    VALUES (new.id, new.title, new.description, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, title, description, category)
+    VALUES ('delete', old.id, old.title, old.description, old.category);
+END;
+CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF title, description, category ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, title, description, category)
+    VALUES ('delete', old.id, old.title, old.description, old.category);
+    INSERT INTO products_fts(rowid, title, description, category)
+    VALUES (new.id, new.title, new.description, new.category);
+END;
+"""
@@ -4,6 +4,7 @@ import os
 import random
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
+from models import PRODUCTS_FTS_SCHEMA
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "webstore.db")
 
@@ -172,6 +173,25 @@ CREATE TABLE IF NOT EXISTS bids (
     FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE CASCADE,
     FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
 );
+-- indexes for hot filter/sort paths (listings, popular, auctions, recently viewed, reviews)
+CREATE INDEX IF NOT EXISTS ix_products_stock_created ON products(stock, created_at);
+CREATE INDEX IF NOT EXISTS ix_products_popular ON products(stock, view_count, created_at);
+CREATE INDEX IF NOT EXISTS ix_products_auction_end ON products(is_auction, auction_end);
+CREATE INDEX IF NOT EXISTS ix_productview_user_viewed ON product_views(user_id, viewed_at);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_productview_user_product ON product_views(user_id, product_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_product_approved_created ON reviews(product_id, is_approved, created_at);
+CREATE INDEX IF NOT EXISTS ix_products_seller_created ON products(seller_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_reviews_approved_created ON reviews(is_approved, created_at);
+CREATE INDEX IF NOT EXISTS ix_addresses_user_created ON addresses(user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_products_category_stock ON products(category, stock);
+CREATE INDEX IF NOT EXISTS ix_favorites_user_created ON favorites(user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created ON notifications(user_id, is_read, created_at);
+CREATE INDEX IF NOT EXISTS ix_bids_product_winning ON bids(product_id, is_winning);
+CREATE INDEX IF NOT EXISTS ix_orders_buyer ON orders(buyer_id);
+CREATE INDEX IF NOT EXISTS ix_order_items_order ON order_items(order_id);
+CREATE INDEX IF NOT EXISTS ix_order_items_product_order ON order_items(product_id, order_id);
+CREATE INDEX IF NOT EXISTS ix_products_created ON products(created_at);
+CREATE INDEX IF NOT EXISTS ix_users_created ON users(created_at);
 """
 
 SAMPLE_USERS = [
@@ -300,6 +320,8 @@ def initialize_db():
     conn.execute("PRAGMA foreign_keys = ON;")
     c = conn.cursor()
     c.executescript(CREATE_SCHEMA)
+    # Search index triggers populate products_fts as sample products are inserted below
+    c.executescript(PRODUCTS_FTS_SCHEMA)
     
     # Insert users
     users_hashed = []